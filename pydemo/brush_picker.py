@@ -2,12 +2,11 @@
 Selects between the default mypaint brushes found in resources/brushes. This widget can only be used if a compatible
 brushlib/libmypaint QT library is available, currently only true for x86_64 Linux.
 """
-from typing import Optional, Any
+from typing import Optional
 import os
-import re
 from PyQt5.QtWidgets import QWidget, QTabWidget, QGridLayout, QScrollArea, QSizePolicy, QMenu
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPaintEvent, QMouseEvent, QResizeEvent
-from PyQt5.QtCore import Qt, QRect, QPoint, QSize, QEvent, pyqtSignal
+from PyQt5.QtGui import QPixmap, QPixmapCache, QImage, QPainter, QPaintEvent, QMouseEvent, QResizeEvent
+from PyQt5.QtCore import Qt, QObject, QRect, QPoint, QSize, QEvent, QRunnable, QThreadPool, pyqtSignal
 from pydemo.util.get_scaled_placement import get_scaled_placement
 from libmypaint_pyqt5 import MPBrushLib as brushlib
 
@@ -19,6 +18,9 @@ class BrushPicker(QTabWidget):
     BRUSH_ORDER_FILE = 'order.conf'
     BRUSH_EXTENSION = '.myb'
     BRUSH_ICON_EXTENSION = '_prev.png'
+    GROUP_PREFIX = 'Group: '
+    ICON_CACHE_LIMIT_KB = 64 * 1024
+    GRID_WIDTH = 5
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         """Loads brushes and optionally adds the widget to a parent.
@@ -29,43 +31,86 @@ class BrushPicker(QTabWidget):
             Optional parent widget.
         """
         super().__init__(parent)
+        if QPixmapCache.cacheLimit() < BrushPicker.ICON_CACHE_LIMIT_KB:
+            QPixmapCache.setCacheLimit(BrushPicker.ICON_CACHE_LIMIT_KB)
         self._groups: list[str] = []
         self._group_orders: dict[str, list[str]] = {}
         self._layouts: dict[str, QGridLayout] = {}
         self._pages: dict[str, QWidget]  = {}
+        self._selected_button: Optional[_IconButton] = None
+        # Tabs waiting for brush buttons, keyed by tab page widget since tab text may be changed by the style:
+        self._pending_groups: dict[QWidget, str] = {}
         self._read_order_file(os.path.join(BrushPicker.BRUSH_DIR, BrushPicker.BRUSH_CONF_FILE))
         # scan for added groups:
-        for group in os.listdir(BrushPicker.BRUSH_DIR):
-            group_dir = os.path.join(BrushPicker.BRUSH_DIR, group)
-            if group in self._group_orders or not os.path.isdir(group_dir):
-                continue
-            if self._read_order_file(os.path.join(group_dir, BrushPicker.BRUSH_ORDER_FILE)):
-                continue
-            # No order.conf: just read in file order
-            self._groups.append(group)
-            self._group_orders[group] = []
-            for file in os.listdir(group_dir):
-                if not file.endswith(BrushPicker.BRUSH_EXTENSION):
+        extension_length = len(BrushPicker.BRUSH_EXTENSION)
+        # Group directories found in the brush directory, including symlinked ones:
+        group_dirs: set[str] = set()
+        with os.scandir(BrushPicker.BRUSH_DIR) as group_entries:
+            for group_entry in group_entries:
+                group = group_entry.name
+                group_dir = group_entry.path
+                if not group_entry.is_dir():
+                    continue
+                group_dirs.add(group)
+                if group in self._group_orders:
                     continue
-                brush_name = file[:-4]
-                self._group_orders[group].append(brush_name)
+                if self._read_order_file(os.path.join(group_dir, BrushPicker.BRUSH_ORDER_FILE)):
+                    continue
+                # No order.conf: just read in file order
+                self._groups.append(group)
+                self._group_orders[group] = []
+                with os.scandir(group_dir) as brush_entries:
+                    for brush_entry in brush_entries:
+                        file = brush_entry.name
+                        if not file.endswith(BrushPicker.BRUSH_EXTENSION) or not brush_entry.is_file():
+                            continue
+                        brush_name = file[:-extension_length]
+                        self._group_orders[group].append(brush_name)
         for group in self._groups:
-            group_dir = os.path.join(BrushPicker.BRUSH_DIR, group)
-            if not os.path.isdir(group_dir):
+            if group not in group_dirs:
                 continue
-            self._create_tab(group)
-            group_layout = self._layouts[group]
-            for x, y, brush in _GridIter(self._group_orders[group]):
-                brush_path = os.path.join(group_dir, brush + BrushPicker.BRUSH_EXTENSION)
-                image_path = os.path.join(group_dir, brush + BrushPicker.BRUSH_ICON_EXTENSION)
-                brush_icon = _IconButton(image_path, brush_path)
-                group_layout.addWidget(brush_icon, y, x)
+            tab = self._create_tab(group)
+            # Brush buttons are created when their tab is first shown, so only one tab's icons load at startup:
+            if tab is not None:
+                self._pending_groups[tab] = group
+        self.currentChanged.connect(self._populate_tab)
+        if self.count() > 0:
+            self._populate_tab(self.currentIndex())
 
 
-    def _create_tab(self, tab_name: str, index: Optional[int] = None) -> None:
-        """Adds a new brush category tab."""
-        if tab_name in self._layouts:
+    def _set_selected(self, button: '_IconButton') -> None:
+        """Marks a brush button as selected, clearing the previous selection."""
+        previous = self._selected_button
+        self._selected_button = button
+        if previous is not None and previous is not button:
+            previous.set_selected(False)
+        button.set_selected(True)
+
+
+    def _populate_tab(self, index: int) -> None:
+        """Creates brush buttons for a tab the first time it is shown."""
+        group = self._pending_groups.pop(self.widget(index), None)
+        if group is None:
             return
+        group_dir = os.path.join(BrushPicker.BRUSH_DIR, group)
+        group_layout = self._layouts[group]
+        path_prefix = f'{group_dir}{os.sep}'
+        brush_extension = BrushPicker.BRUSH_EXTENSION
+        icon_extension = BrushPicker.BRUSH_ICON_EXTENSION
+        for i, brush in enumerate(self._group_orders[group]):
+            y, x = divmod(i, BrushPicker.GRID_WIDTH)
+            brush_path = f'{path_prefix}{brush}{brush_extension}'
+            image_path = f'{path_prefix}{brush}{icon_extension}'
+            brush_icon = _IconButton(image_path, brush_path)
+            if brush_icon.is_selected():
+                self._selected_button = brush_icon
+            group_layout.addWidget(brush_icon, y, x)
+
+
+    def _create_tab(self, tab_name: str, index: Optional[int] = None) -> Optional[QScrollArea]:
+        """Adds a new brush category tab, returning the new tab page or None if the tab already exists."""
+        if tab_name in self._layouts:
+            return None
         tab = QScrollArea(self)
         tab.setWidgetResizable(True)
         content = QWidget(tab)
@@ -78,33 +123,56 @@ class BrushPicker(QTabWidget):
             self.addTab(tab, tab_name)
         else:
             self.insertTab(index, tab, tab_name)
+        return tab
 
 
     def _read_order_file(self, file_path: str) -> bool:
         if not os.path.exists(file_path):
             return False
         with open(file_path, 'r', encoding='utf-8') as file:
-            lines = [ln.strip() for ln in file.readlines()]
-        for line in lines:
-            group_match = re.search(r'^Group: ([^#]+)', line)
-            if group_match:
-                group = group_match.group(1)
-                self._groups.append(group)
-                self._group_orders[group] = []
-                continue
-            if '/' not in line:
-                continue
-            group, brush = line.split('/')
-            if group not in self._group_orders:
-                self._groups.append(group)
-                self._group_orders[group] = []
-            self._group_orders[group].append(brush)
+            for raw_line in file:
+                line = raw_line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith(BrushPicker.GROUP_PREFIX):
+                    group = line[len(BrushPicker.GROUP_PREFIX):].split('#', 1)[0].strip()
+                    self._groups.append(group)
+                    self._group_orders[group] = []
+                    continue
+                if '/' not in line:
+                    continue
+                group, _, brush = line.partition('/')
+                if group not in self._group_orders:
+                    self._groups.append(group)
+                    self._group_orders[group] = []
+                self._group_orders[group].append(brush)
         return True
 
 
+class _IconLoader(QRunnable):
+    """Decodes a brush icon image on a QThreadPool worker thread."""
+
+    class _Signals(QObject):
+        loaded = pyqtSignal(QImage)
+
+    def __init__(self, image_path: str) -> None:
+        """Sets the path of the loaded image."""
+        super().__init__()
+        self._image_path = image_path
+        self.signals = _IconLoader._Signals()
+
+    def run(self) -> None:
+        """Loads the image, and passes it to connected slots. QPixmaps can only be created on the GUI thread, so this
+        only handles QImage decoding."""
+        self.signals.loaded.emit(QImage(self._image_path))
+
+
 class _IconButton(QWidget):
     """Button widget used to select a single brush."""
 
+    # Size used for layout before an icon finishes loading, matching the default mypaint preview size:
+    DEFAULT_ICON_SIZE = QSize(128, 128)
+
     def __init__(self, imagepath: str, brushpath: str) -> None:
         """Initialize using paths to the brush file and icon."""
         super().__init__()
@@ -112,10 +180,13 @@ class _IconButton(QWidget):
         self._brushpath = brushpath
         self._imagepath = imagepath
         self._image_rect: Optional[QRect] = None
-        self._image = QPixmap(imagepath)
-        inverted = QImage(imagepath)
-        inverted.invertPixels(QImage.InvertRgba)
-        self._image_inverted = QPixmap.fromImage(inverted)
+        self._image: Optional[QPixmap] = QPixmapCache.find(imagepath)
+        if self._image is None:
+            loader = _IconLoader(imagepath)
+            loader.signals.loaded.connect(self._image_loaded)
+            QThreadPool.globalInstance().start(loader)
+        active_brush = brushlib.get_active_brush()
+        self._selected = active_brush is not None and active_brush == brushpath
         size_policy = QSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.MinimumExpanding)
         size_policy.setWidthForHeight(True)
         self.setSizePolicy(size_policy)
@@ -132,62 +203,59 @@ class _IconButton(QWidget):
 
     def sizeHint(self) -> QSize:
         """Set ideal size based on the brush icon size."""
+        if self._image is None:
+            return _IconButton.DEFAULT_ICON_SIZE
         return self._image.size()
 
     def is_selected(self) -> bool:
         """Checks whether this brush is the selected brush."""
-        active_brush = brushlib.get_active_brush()
-        return active_brush is not None and active_brush == self._brushpath
+        return self._selected
+
+    def set_selected(self, selected: bool) -> None:
+        """Updates the selection state, repainting only if it changed."""
+        if selected != self._selected:
+            self._selected = selected
+            self.update()
 
     def resizeEvent(self, unused_event: Optional[QResizeEvent]) -> None:
         """Recalculates icon bounds when the widget size changes."""
-        self._image_rect = get_scaled_placement(QRect(0, 0, self.width(), self.height()), self._image.size())
+        self._image_rect = get_scaled_placement(QRect(0, 0, self.width(), self.height()), self.sizeHint())
 
-    def paintEvent(self, unused_event: Optional[QPaintEvent]) -> None:
+    def paintEvent(self, event: Optional[QPaintEvent]) -> None:
         """Paints the icon image in the widget bounds, preserving aspect ratio."""
-        if self._image_rect is None:
+        if self._image_rect is None or (event is not None and not event.rect().intersects(self._image_rect)):
             return
         painter = QPainter(self)
         painter.fillRect(self._image_rect, Qt.GlobalColor.red)
+        if self._image is None:
+            return
+        painter.drawPixmap(self._image_rect, self._image)
         if self.is_selected():
-            painter.drawPixmap(self._image_rect, self._image_inverted)
-        else:
-            painter.drawPixmap(self._image_rect, self._image)
+            # Invert the icon colors in place to mark the selected brush:
+            painter.setCompositionMode(QPainter.CompositionMode_Difference)
+            painter.fillRect(self._image_rect, Qt.GlobalColor.white)
+
+    def _image_loaded(self, image: QImage) -> None:
+        """Receives an icon decoded by an _IconLoader and converts it to a cached QPixmap."""
+        self._image = QPixmap.fromImage(image)
+        QPixmapCache.insert(self._imagepath, self._image)
+        self.updateGeometry()
+        self.resizeEvent(None)
+        self.update()
 
     def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
         """Load the associated brush when left-clicked."""
-        if event is not None and event.button() == Qt.MouseButton.LeftButton and not self.is_selected() \
-                and self._image_rect is not None and self._image_rect.contains(event.pos()):
+        if event is None or event.button() != Qt.MouseButton.LeftButton or self._image_rect is None \
+                or not self._image_rect.contains(event.pos()):
+            return
+        # The active brush may have been changed elsewhere since the cached selection state was set, so check brushlib
+        # directly instead of relying on is_selected(), and update the selection even if the brush is already active:
+        if brushlib.get_active_brush() != self._brushpath:
             brushlib.load_brush(self._brushpath)
-            parent = self.parent()
-            if isinstance(parent, QWidget):
-                parent.update()
-
-class _GridIter():
-    """Iterates through brush grid positions and list items."""
-    WIDTH = 5
-
-    def __init__(self, item_list: list[Any], i: int = 0):
-        """Sets the iterated list and initial list index."""
-        self._list = item_list
-        self._i = i
-        self._x = 0
-        self._y = 0
-
-    def __iter__(self):
-        self._x = self._i % _GridIter.WIDTH
-        self._y = self._i // _GridIter.WIDTH
-        return self
-
-    def __next__(self) -> tuple[int, int, Any]:
-        """returns the next column, row, list item."""
-        x = self._x
-        y = self._y
-        i = x + y * _GridIter.WIDTH
-        if i >= len(self._list):
-            raise StopIteration
-        self._x += 1
-        if self._x >= _GridIter.WIDTH:
-            self._y += 1
-            self._x = 0
-        return x, y, self._list[i]
+        parent = self.parent()
+        while parent is not None and not isinstance(parent, BrushPicker):
+            parent = parent.parent()
+        if parent is not None:
+            parent._set_selected(self)
+        else:
+            self.set_selected(True)
@@ -1,6 +1,7 @@
 """
 Panel used to edit the selected area of the edited image.
 """
+from typing import Optional
 from PyQt5.QtWidgets import QWidget, QPushButton, QColorDialog, QGridLayout, QHBoxLayout, QSlider, QSpinBox, QLabel
 from PyQt5.QtCore import Qt, QSize, QEvent
 from PyQt5.QtGui import QPainter, QPen, QCursor, QPixmap, QIcon, QColor
@@ -8,6 +9,7 @@ from PyQt5.QtGui import QPainter, QPen, QCursor, QPixmap, QIcon, QColor
 from pydemo.canvas_widget import CanvasWidget
 from pydemo.util.equal_margins import get_equal_margins
 from pydemo.util.contrast_color import contrast_color
+from pydemo.util.cached_pixmap import get_cached_pixmap
 from pydemo.brush_picker import BrushPicker
 from pydemo.mypaint_canvas import MypaintCanvas
 from pydemo.util.canvas import Canvas
@@ -16,27 +18,34 @@ from pydemo.util.canvas import Canvas
 class CanvasPanel(QWidget):
     """CanvasPanel is used to edit the selected area of the edited image."""
 
+    CURSOR_PATH = './pydemo/resources/cursor.png'
+    SMALL_CURSOR_PATH = './pydemo/resources/minCursor.png'
+    EYEDROPPER_PATH = './pydemo/resources/eyedropper.png'
+    CLEAR_ICON_PATH = './pydemo/resources/clear.png'
+    FILL_ICON_PATH = './pydemo/resources/fill.png'
+    BRUSH_ICON_PATH = './resources/brush.png'
+
     def __init__(self, canvas: Canvas) -> None:
         """Initialize the panel with the edited image."""
         super().__init__()
-        self._cursor_pixmap = QPixmap('./pydemo/resources/cursor.png')
-        small_cursor_pixmap = QPixmap('./pydemo/resources/minCursor.png')
-        self._small_cursor = QCursor(small_cursor_pixmap)
-        eyedropper_icon = QPixmap('./pydemo/resources/eyedropper.png')
-        self._eyedropper_cursor = QCursor(eyedropper_icon, hotX=0, hotY=eyedropper_icon.height())
+        # Cursor images are loaded on first use, scaled brush cursors are cached by size:
+        self._eyedropper_cursor: Optional[QCursor] = None
+        self._scaled_cursor_cache: dict[int, QCursor] = {}
         self._last_cursor_size = None
+        self._border_pen: Optional[QPen] = None
+        self._brush_color_pen: Optional[QPen] = None
         self._brush_picker_button = None
         self._canvas = canvas
 
         self._canvas_widget = CanvasWidget(self, canvas)
         self._canvas_widget.setMinimumSize(QSize(256, 256))
 
+        self._color_icon_pixmap = QPixmap(QSize(64, 64))
         def set_brush_color(color: QColor):
             self._canvas_widget.set_brush_color(color)
             if self._color_picker_button is not None:
-                icon = QPixmap(QSize(64, 64))
-                icon.fill(color)
-                self._color_picker_button.setIcon(QIcon(icon))
+                self._color_icon_pixmap.fill(color)
+                self._color_picker_button.setIcon(QIcon(self._color_icon_pixmap))
             self.update()
         self._canvas_widget.color_selected.connect(set_brush_color)
 
@@ -56,12 +65,17 @@ class CanvasPanel(QWidget):
         self._slider_spinbox = QSpinBox(self._slider_widget)
         self._slider.setRange(0, 300)
         self._slider_spinbox.setRange(0, 300)
+        # Signals are blocked while syncing the two inputs, so each change only updates the brush size once:
         def slider_change(value):
+            self._slider_spinbox.blockSignals(True)
             self._slider_spinbox.setValue(value)
+            self._slider_spinbox.blockSignals(False)
             self._canvas.set_brush_size(value)
         self._slider.valueChanged.connect(slider_change)
         def spinbox_change(value):
+            self._slider.blockSignals(True)
             self._slider.setValue(value)
+            self._slider.blockSignals(False)
             self._canvas.set_brush_size(value)
         self._slider_spinbox.valueChanged.connect(spinbox_change)
         self._slider_layout.addWidget(self._slider_label, stretch = 2)
@@ -70,14 +84,14 @@ class CanvasPanel(QWidget):
 
         self._clear_button = QPushButton()
         self._clear_button.setText('clear')
-        self._clear_button.setIcon(QIcon(QPixmap('./pydemo/resources/clear.png')))
+        self._clear_button.setIcon(QIcon(CanvasPanel.CLEAR_ICON_PATH))
         def clear():
             self._canvas_widget.clear()
         self._clear_button.clicked.connect(clear)
 
         self._fill_button = QPushButton()
         self._fill_button.setText('fill')
-        self._fill_button.setIcon(QIcon(QPixmap('./pydemo/resources/fill.png')))
+        self._fill_button.setIcon(QIcon(CanvasPanel.FILL_ICON_PATH))
         def fill():
             self._canvas_widget.fill()
         self._fill_button.clicked.connect(fill)
@@ -86,7 +100,7 @@ class CanvasPanel(QWidget):
         self._brush_picker = None
         self._brush_picker_button.setText('Brush')
         self._brush_picker_button.setToolTip('Select sketch brush type')
-        self._brush_picker_button.setIcon(QIcon(QPixmap('./resources/brush.png')))
+        self._brush_picker_button.setIcon(QIcon(CanvasPanel.BRUSH_ICON_PATH))
         def open_brush_picker():
             if self._brush_picker is None:
                 self._brush_picker = BrushPicker()
@@ -118,14 +132,27 @@ class CanvasPanel(QWidget):
         """Draws a border around the panel."""
         super().paintEvent(event)
         painter = QPainter(self)
-        painter.setPen(QPen(contrast_color(self), self._border_size//2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        if self._border_pen is None:
+            self._border_pen = QPen(contrast_color(self), self._border_size//2, Qt.SolidLine, Qt.RoundCap,
+                    Qt.RoundJoin)
+        painter.setPen(self._border_pen)
         painter.drawRect(1, 1, self.width() - 2, self.height() - 2)
         if not self._color_picker_button.isHidden():
-            painter.setPen(QPen(self._canvas_widget.get_brush_color(), self._border_size//2, Qt.SolidLine, Qt.RoundCap,
-                        Qt.RoundJoin))
+            brush_color = self._canvas_widget.get_brush_color()
+            if self._brush_color_pen is None or self._brush_color_pen.color() != brush_color:
+                self._brush_color_pen = QPen(brush_color, self._border_size//2, Qt.SolidLine, Qt.RoundCap,
+                        Qt.RoundJoin)
+            painter.setPen(self._brush_color_pen)
             painter.drawRect(self._color_picker_button.geometry())
 
 
+    def changeEvent(self, event: QEvent):
+        """Discard the cached border pen when the palette or style changes."""
+        super().changeEvent(event)
+        if event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._border_pen = None
+
+
     def resizeEvent(self, unused_event: QEvent):
         """Update brush cursor sizing when the widget size changes."""
         self._update_brush_cursor()
@@ -136,7 +163,7 @@ class CanvasPanel(QWidget):
         if event.type() == QEvent.KeyPress:
             if event.key() == Qt.Key_Control and not self._canvas_widget.get_draw_mode() == MaskCreator.DrawMode.MASK:
                 self._canvas_widget.set_line_mode(False)
-                self._canvas_widget.setCursor(self._eyedropper_cursor)
+                self._canvas_widget.setCursor(self._get_eyedropper_cursor())
             elif event.key() == Qt.Key_Shift:
                 self._canvas_widget.set_line_mode(True)
         elif event.type() == QEvent.KeyRelease:
@@ -167,9 +194,22 @@ class CanvasPanel(QWidget):
         scaled_size = max(int(brush_size * scale), 9)
         if scaled_size == self._last_cursor_size:
             return
-        if scaled_size <= 10:
-            self._canvas_widget.setCursor(self._small_cursor)
-        else:
-            new_cursor = QCursor(self._cursor_pixmap.scaled(QSize(scaled_size, scaled_size)))
-            self._canvas_widget.setCursor(new_cursor)
+        cursor = self._scaled_cursor_cache.get(scaled_size)
+        if cursor is None:
+            if scaled_size <= 10:
+                cursor = QCursor(get_cached_pixmap(CanvasPanel.SMALL_CURSOR_PATH))
+            else:
+                cursor_pixmap = get_cached_pixmap(CanvasPanel.CURSOR_PATH)
+                cursor = QCursor(cursor_pixmap.scaled(scaled_size, scaled_size, Qt.IgnoreAspectRatio,
+                        Qt.FastTransformation))
+            self._scaled_cursor_cache[scaled_size] = cursor
+        self._canvas_widget.setCursor(cursor)
         self._last_cursor_size = scaled_size
+
+
+    def _get_eyedropper_cursor(self) -> QCursor:
+        """Returns the eyedropper cursor, creating it on first use."""
+        if self._eyedropper_cursor is None:
+            eyedropper_icon = get_cached_pixmap(CanvasPanel.EYEDROPPER_PATH)
+            self._eyedropper_cursor = QCursor(eyedropper_icon, hotX=0, hotY=eyedropper_icon.height())
+        return self._eyedropper_cursor
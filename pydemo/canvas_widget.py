@@ -8,11 +8,22 @@ from PyQt5.QtWidgets import QApplication, QWidget
 from pydemo.util.fixed_aspect_graphics_view import FixedAspectGraphicsView
 from pydemo.util.canvas import Canvas
 
+def _blend_colors(sketch_color: QColor, image_color: QColor) -> QColor:
+    """Returns the opaque color produced by drawing sketch_color over image_color, using integer channel math."""
+    sketch_r, sketch_g, sketch_b, sketch_alpha = sketch_color.getRgb()
+    image_r, image_g, image_b, image_alpha = image_color.getRgb()
+    # Integer form of sketch * sketch_alpha + image * image_alpha * (1 - sketch_alpha), with alpha in [0, 255]:
+    sketch_weight = sketch_alpha * 255
+    image_weight = image_alpha * (255 - sketch_alpha)
+    return QColor((sketch_r * sketch_weight + image_r * image_weight) // 65025,
+            (sketch_g * sketch_weight + image_g * image_weight) // 65025,
+            (sketch_b * sketch_weight + image_b * image_weight) // 65025)
+
+
 class CanvasWidget(FixedAspectGraphicsView):
     """QWidget providing a mypaint drawing surface."""
     color_selected = pyqtSignal(QColor)
 
-
     def __init__(self, parent: Optional[QWidget], canvas: Canvas) -> None:
         super().__init__(parent)
         self._canvas = canvas
@@ -24,6 +35,8 @@ class CanvasWidget(FixedAspectGraphicsView):
         self._tablet_eraser = False
         self._image_section = None
         self._image_pixmap = None
+        # Strokes only repaint the area around new content, so keep the rest of the viewport on resize/expose:
+        self.viewport().setAttribute(Qt.WA_StaticContents, True)
         self.content_size = self._canvas.size()
         canvas.add_to_scene(self.scene(), 0)
         self.resizeEvent(None)
@@ -73,19 +86,17 @@ class CanvasWidget(FixedAspectGraphicsView):
 
         If the point is outside of the widget bounds, QColor(0, 0, 0) is returned instead.
         """
-        sketch_color = QColor(0, 0, 0, 0)
-        image_color = QColor(0, 0, 0, 0)
-        if self._canvas.has_sketch():
+        if self._image_section is None:
+            image_color = QColor(0, 0, 0, 0)
+        else:
+            image_color = self._image_section.pixelColor(point)
+        if not self._canvas.has_sketch():
+            if image_color.alpha() == 255:
+                return image_color
+            sketch_color = QColor(0, 0, 0, 0)
+        else:
             sketch_color = self._canvas.get_color_at_point(point)
-        image_color = self._image_section.pixelColor(point)
-        def get_component(sketch_component, image_component):
-            return int((sketch_component * sketch_color.alphaF()) + (image_component * image_color.alphaF()
-                        * (1.0 - sketch_color.alphaF())))
-        red = get_component(sketch_color.red(), image_color.red())
-        green = get_component(sketch_color.green(), image_color.green())
-        blue = get_component(sketch_color.blue(), image_color.blue())
-        combined = QColor(red, green, blue)
-        return combined
+        return _blend_colors(sketch_color, image_color)
 
 
     def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
@@ -126,14 +137,12 @@ class CanvasWidget(FixedAspectGraphicsView):
             return
         if (Qt.LeftButton == event.buttons() or Qt.RightButton == event.buttons()) and self._drawing:
             size_override = 1 if Qt.RightButton == event.buttons() else None
-            canvas = self._canvas
-            color = QColor(self._brush_color)
             size_multiplier = self._pen_pressure if (self._pen_pressure is not None) else 1.0
             new_last_point = self.widget_to_scene_coords(event.pos()).toPoint()
-            line = QLine(self._last_point, new_last_point)
+            # The canvas batches stroke points itself, so each movement is passed on immediately:
+            self._canvas.draw_line(QLine(self._last_point, new_last_point), self._brush_color, size_multiplier,
+                    size_override)
             self._last_point = new_last_point
-            canvas.draw_line(line, color, size_multiplier, size_override)
-            self.update()
 
 
     def tabletEvent(self, tabletEvent: Optional[QTabletEvent]) -> None:
@@ -5,19 +5,30 @@ sections. Allows painting in full color with drawing tablet support, using .myb
 from typing import Optional
 import atexit
 import math
-from PyQt5.QtGui import QPainter, QImage, QPixmap, QColor
-from PyQt5.QtCore import Qt, QLine, QSize, QPoint, QRect
+import sys
+from PyQt5.QtGui import QImage, QPixmap, QColor
+from PyQt5.QtCore import Qt, QLine, QSize, QPoint, QRect, QTimer
 from PyQt5.QtWidgets import QGraphicsScene
 from PIL import Image
 from pydemo.util.canvas import Canvas
-from pydemo.util.image_utils import pil_image_to_qimage
 from libmypaint_pyqt5 import MPBrushLib as brushlib
 
+# Logarithmic brush radius values for brush sizes up to 1024 pixels. Size 0 uses the minimum one pixel radius, as the
+# logarithm of zero is undefined.
+_LOG_RADIUS = (0.0,) + tuple(math.log(size / 2) for size in range(1, 1025))
 
 class MypaintCanvas(Canvas):
     """MypaintCanvas provides an image editing layer that uses the MyPaint brush engine."""
 
+    __slots__ = ('_pending_stroke_points', '_last_brush_rgba', '_stroke_timer', '_visible', '_size', '_drawing',
+            '_scene', '_scale', '_has_sketch', '_saved_brush_size', '_saved_image', '_cached_qimage',
+            '_fill_image')
+
     RADIUS_LOG = brushlib.BrushSetting.MYPAINT_BRUSH_SETTING_RADIUS_LOGARITHMIC
+    # PIL raw mode that matches the in-memory byte order of QImage.Format_ARGB32:
+    ARGB32_RAW_MODE = 'BGRA' if sys.byteorder == 'little' else 'ARGB'
+    # Maximum number of buffered stroke points before they're sent to brushlib:
+    MAX_PENDING_STROKE_POINTS = 64
 
     def __init__(self, size: QSize) -> None:
         """Initialize with config values and optional arbitrary initial image data.
@@ -28,6 +39,16 @@ class MypaintCanvas(Canvas):
             Used for setting initial size if no initial image data is provided.
         image: QImage or PIL Image or QPixmap or QSize or str, optional
         """
+        # Stroke points are buffered as consecutive x, y, pressure values and drawn in batches, either when the buffer
+        # fills, when the event loop is next idle, or before any operation that depends on canvas or brush state.
+        # Integer coordinates are converted to qreal by the binding, so they're stored without converting to float:
+        self._pending_stroke_points: list[float | int] = []
+        # Brush color last sent to brushlib as a QColor.rgba() value, or None if it needs to be set again:
+        self._last_brush_rgba: Optional[int] = None
+        self._stroke_timer = QTimer()
+        self._stroke_timer.setSingleShot(True)
+        self._stroke_timer.setInterval(0)
+        self._stroke_timer.timeout.connect(self._flush_stroke_points)
         super().__init__(size)
         self._visible = True
         self._size = size
@@ -38,6 +59,9 @@ class MypaintCanvas(Canvas):
         self._has_sketch = False
         self._saved_brush_size: Optional[int] = None
         self._saved_image: Optional[QImage] = None
+        # Rendering the surface is expensive, so the last rendered image is kept until canvas content changes:
+        self._cached_qimage: Optional[QImage] = None
+        self._fill_image: Optional[QImage] = None
         self.set_image(size)
         #atexit.register(lambda: self.clear())
 
@@ -56,7 +80,9 @@ class MypaintCanvas(Canvas):
             Path to a valid MyPaint brush file. These files contain JSON data in the format specified by MyPaint and
             usually have the .myb extension.
         """
+        self._flush_stroke_points()
         brushlib.load_brush(brush_path, True)
+        self._last_brush_rgba = None
         self.set_brush_size(self.brush_size())
 
 
@@ -68,8 +94,9 @@ class MypaintCanvas(Canvas):
         size : int
             Base brush blot diameter in pixels.
         """
+        self._flush_stroke_points()
         super().set_brush_size(size)
-        size_log_radius = math.log(size / 2)
+        size_log_radius = _LOG_RADIUS[size] if 0 <= size < len(_LOG_RADIUS) else math.log(size / 2)
         brushlib.set_brush_value(MypaintCanvas.RADIUS_LOG, size_log_radius)
 
 
@@ -96,7 +123,9 @@ class MypaintCanvas(Canvas):
             An image, image size, or image path. If necessary, the canvas will be resized to match the image size.
             If image_data is a QSize, the canvas will be cleared.
         """
+        self._flush_stroke_points()
         brushlib.clear_surface()
+        self._cached_qimage = None
         image = None
         if isinstance(image_data, QSize):
             if self.size() != image_data:
@@ -104,17 +133,18 @@ class MypaintCanvas(Canvas):
         elif isinstance(image_data, str):
             image = QImage(image_data)
         elif isinstance(image_data, Image.Image):
-            image = pil_image_to_qimage(image_data)
+            # Export PIL data directly in QImage.Format_ARGB32 byte order, so no conversion pass is needed:
+            pil_image = image_data if image_data.mode == 'RGBA' else image_data.convert('RGBA')
+            image_bytes = pil_image.tobytes('raw', MypaintCanvas.ARGB32_RAW_MODE)
+            image = QImage(image_bytes, pil_image.width, pil_image.height, pil_image.width * 4, QImage.Format_ARGB32)
         elif isinstance(image_data, QImage):
             image = image_data
         else:
             raise TypeError(f'Invalid image param {image_data}')
         if image is not None:
-            if self.size() != image_data.size():
-                brushlib.set_surface_size(image_data.size())
             if image.format() != QImage.Format_ARGB32:
                 image.convertTo(QImage.Format_ARGB32)
-            brushlib.load_image(image)
+            brushlib.load_image_resize(image)
 
 
     def size(self) -> QSize:
@@ -134,10 +164,21 @@ class MypaintCanvas(Canvas):
 
     def get_qimage(self) -> QImage:
         """Returns all canvas image content as a QImage."""
-        image = brushlib.render_image()
-        if image.size() != self.size():
-            image = image.scaled(self.size())
-        return image
+        self._flush_stroke_points()
+        if self._cached_qimage is None:
+            image = brushlib.render_image()
+            size = self.size()
+            if image.size() != size:
+                image = image.scaled(size)
+            self._cached_qimage = image
+        # QImage data is implicitly shared, so this copy is cheap and protects the cache from in-place changes:
+        return QImage(self._cached_qimage)
+
+
+    def _get_qimage_for_snapshot(self) -> QImage:
+        """Returns the rendered canvas image without copying it. Rendered images are never modified in place, so
+        sharing the image data is safe."""
+        return self.get_qimage()
 
 
     def resize(self, size: QSize) -> None:
@@ -160,6 +201,7 @@ class MypaintCanvas(Canvas):
         if not self._visible:
             return
         super().start_stroke()
+        self._flush_stroke_points()
         brushlib.start_stroke()
         self._drawing = True
 
@@ -168,7 +210,10 @@ class MypaintCanvas(Canvas):
         """Signals the end of a brush stroke, to be called once whenever user input stops or pauses."""
         if not self._visible:
             return
+        self._flush_stroke_points()
         brushlib.end_stroke()
+        self._last_brush_rgba = None
+        self._cached_qimage = None
         self._drawing = False
         if self._saved_brush_size is not None:
             self.set_brush_size(self._saved_brush_size)
@@ -195,7 +240,7 @@ class MypaintCanvas(Canvas):
         """
         if not self._visible:
             return
-        self._draw(point, color, size_multiplier, size_override)
+        self._draw_point(point, color, size_multiplier, size_override)
 
 
     def draw_line(self,
@@ -218,7 +263,7 @@ class MypaintCanvas(Canvas):
         """
         if not self._visible:
             return
-        self._draw(line, color, size_multiplier, size_override)
+        self._draw_line(line, color, size_multiplier, size_override)
 
 
     def fill(self, color: QColor) -> None:
@@ -228,18 +273,19 @@ class MypaintCanvas(Canvas):
         super().fill(color)
         self._has_sketch = True
         size = self.size()
-        image = QImage(size, QImage.Format_ARGB32)
-        painter = QPainter(image)
-        painter.fillRect(0, 0, size.width(), size.height(), color)
-        painter.end()
+        # The surface copies image data when it's loaded, so the same fill buffer can be reused while size is unchanged:
+        image = self._fill_image
+        if image is None or image.size() != size:
+            image = QImage(size, QImage.Format_ARGB32)
+            self._fill_image = image
+        image.fill(color.rgba())
         self.set_image(image)
 
 
     def clear(self) -> None:
         """Replaces all canvas image contents with transparency.  Does nothing if connected to an image layer."""
         super().clear()
-        self._has_sketch = False
-        brushlib.clear_surface()
+        self._clear_surface()
 
 
     def setVisible(self, visible: bool) -> None:
@@ -252,37 +298,77 @@ class MypaintCanvas(Canvas):
                 self.set_image(self._saved_image)
                 self._saved_image = None
         else:
-            self._saved_image = self.get_qimage()
-            self.clear()
+            # Render once, and use that image both for restoring content and for the undo state:
+            self._saved_image = self._get_qimage_for_snapshot()
+            self._save_undo_state(image=self._saved_image)
+            self._clear_surface()
 
 
-    def _draw(self,
-            pos: QPoint | QLine,
-            color: QColor,
-            size_multiplier: Optional[float],
-            size_override: Optional[int] = None) -> None:
-        if not self._visible:
-            return
+    def _clear_surface(self) -> None:
+        """Erases all surface contents and discards buffered stroke points without saving undo state."""
+        self._has_sketch = False
+        self._pending_stroke_points.clear()
+        brushlib.clear_surface()
+        self._cached_qimage = None
+
+
+    def _prepare_draw(self, color: QColor, size_multiplier: Optional[float], size_override: Optional[int]) -> float:
+        """Applies brush size and color changes before drawing, returning the pressure value to use."""
         if size_override is not None:
             if self._saved_brush_size is None:
                 self._saved_brush_size = self.brush_size()
-            self.set_brush_size(size_override)
+            if size_override != self.brush_size():
+                self.set_brush_size(size_override)
         self._has_sketch = True
-        brushlib.set_brush_color(color)
+        self._cached_qimage = None
+        rgba = color.rgba()
+        if rgba != self._last_brush_rgba:
+            self._flush_stroke_points()
+            brushlib.set_brush_color(color)
+            self._last_brush_rgba = rgba
+        return 1.0 if size_multiplier is None else size_multiplier
+
+
+    def _draw_point(self,
+            point: QPoint,
+            color: QColor,
+            size_multiplier: Optional[float],
+            size_override: Optional[int] = None) -> None:
+        pressure = self._prepare_draw(color, size_multiplier, size_override)
+        if not self._drawing:
+            self.start_stroke()
+        self._pending_stroke_points += (point.x(), point.y(), pressure)
+        self._schedule_stroke_flush()
+
+
+    def _draw_line(self,
+            line: QLine,
+            color: QColor,
+            size_multiplier: Optional[float],
+            size_override: Optional[int] = None) -> None:
+        pressure = self._prepare_draw(color, size_multiplier, size_override)
+        points = self._pending_stroke_points
         if not self._drawing:
             self.start_stroke()
-            if isinstance(pos, QLine):
-                if size_multiplier is None:
-                    brushlib.basic_stroke_to(float(pos.x1()), float(pos.y1()))
-                else:
-                    brushlib.stroke_to(float(pos.x1()), float(pos.y1()), size_multiplier, 0.0, 0.0)
-        if isinstance(pos, QLine):
-            if size_multiplier is None:
-                brushlib.basic_stroke_to(float(pos.x2()), float(pos.y2()))
-            else:
-                brushlib.stroke_to(float(pos.x2()), float(pos.y2()), size_multiplier, 0.0, 0.0)
-        else: #QPoint
-            if size_multiplier is None:
-                brushlib.basic_stroke_to(float(pos.x()), float(pos.y()))
-            else:
-                brushlib.stroke_to(float(pos.x()), float(pos.y()), size_multiplier, 0.0, 0.0)
+            points += (line.x1(), line.y1(), pressure)
+        points += (line.x2(), line.y2(), pressure)
+        self._schedule_stroke_flush()
+
+
+    def _schedule_stroke_flush(self) -> None:
+        """Draws buffered stroke points immediately if the buffer is full, or schedules drawing them once the event
+        loop is idle."""
+        if len(self._pending_stroke_points) >= MypaintCanvas.MAX_PENDING_STROKE_POINTS * 3:
+            self._flush_stroke_points()
+        elif not self._stroke_timer.isActive():
+            self._stroke_timer.start()
+
+
+    def _flush_stroke_points(self) -> None:
+        """Draws all buffered stroke points with a single brushlib call."""
+        self._stroke_timer.stop()
+        if len(self._pending_stroke_points) == 0:
+            return
+        brushlib.stroke_to_batch(self._pending_stroke_points)
+        self._pending_stroke_points.clear()
+        self._cached_qimage = None
@@ -0,0 +1,11 @@
+"""Loads image files as QPixmaps, sharing decoded images through the global QPixmapCache."""
+
+from PyQt5.QtGui import QPixmap, QPixmapCache
+
+def get_cached_pixmap(image_path: str) -> QPixmap:
+    """Returns a QPixmap loaded from an image path, decoding the file only if it isn't already cached."""
+    pixmap = QPixmapCache.find(image_path)
+    if pixmap is None:
+        pixmap = QPixmap(image_path)
+        QPixmapCache.insert(image_path, pixmap)
+    return pixmap
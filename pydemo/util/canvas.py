@@ -2,13 +2,20 @@
 operations.
 """
 from typing import Optional
+from collections import deque
 import datetime
 from PIL import Image
-from PyQt5.QtGui import QImage, QPixmap, QColor
-from PyQt5.QtCore import QObject, QPoint, QLine, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap, QColor, QPixelFormat, qUnpremultiply
+from PyQt5.QtCore import QObject, QPoint, QLine, QSize, QBuffer, QByteArray, pyqtSignal, pyqtBoundSignal
 from PyQt5.QtWidgets import QGraphicsScene
 from pydemo.util.image_utils import qimage_to_pil_image
 
+class _SignalWrapper(QObject):
+    """Directly inheriting from QObject can cause problems with multiple inheritance, so Canvas uses a wrapped inner
+    QObject to handle PyQt5 signals."""
+    enabled_state_changed = pyqtSignal(bool)
+
+
 class Canvas():
     """Interface for classes that display image data through a QGraphicsView and support various drawing and editing
        operations.
@@ -19,14 +26,31 @@ class Canvas():
         Emitted whenever a Canvas is enabled or disabled.
     """
 
+    # Canvas attributes are read on every drawing operation, so they're stored in slots instead of an instance dict.
+    # Subclasses that also declare __slots__ must list any attributes they add. __weakref__ is kept so that bound
+    # methods can still be connected to Qt signals.
+    __slots__ = ('_brush_size', '_image', '_signal_wrapper', '_undo_stack', '_redo_stack', '_enabled', '__weakref__')
+
     MAX_UNDO = 30
+    # Undo states are stored as PNG data. This quality value selects fast, light compression (zlib level 1):
+    UNDO_PNG_QUALITY = 80
 
     class UndoState():
-        """Stores a timestamped image change for undo/redo purposes."""
+        """Stores a timestamped image change for undo/redo purposes, compressed as PNG data."""
+        __slots__ = ('_data', 'timestamp')
+
         def __init__(self, image: QImage):
-            self.image = image
+            self._data = QByteArray()
+            buffer = QBuffer(self._data)
+            buffer.open(QBuffer.WriteOnly)
+            image.save(buffer, 'PNG', Canvas.UNDO_PNG_QUALITY)
+            buffer.close()
             self.timestamp = datetime.datetime.now().timestamp()
 
+        def image(self) -> QImage:
+            """Decompresses and returns the saved image."""
+            return QImage.fromData(self._data, 'PNG')
+
 
     def __init__(self, image: QImage) -> None:
         """Initialize with initial image data.
@@ -38,31 +62,33 @@ class Canvas():
         super().__init__()
         self._brush_size = 1
         self._image: Optional[QPixmap] = None
-
-
-        # Directly inheriting from QObject can cause problems with multiple inheritance, so Canvas will use a wrapped
-        # inner QObject to handle PyQt5 signals.
-        class _SignalWrapper(QObject):
-            enabled_state_changed = pyqtSignal(bool)
-
-        self._signal_wrapper = _SignalWrapper()
-        self.enabled_state_changed = self._signal_wrapper.enabled_state_changed
-        self._undo_stack = []
-        self._redo_stack = []
+        # Created on first access to enabled_state_changed, see _SignalWrapper above:
+        self._signal_wrapper: Optional[_SignalWrapper] = None
+        self._undo_stack: deque[Canvas.UndoState] = deque(maxlen=Canvas.MAX_UNDO)
+        self._redo_stack: deque[Canvas.UndoState] = deque()
         if image is not None:
             self.set_image(image)
         self._enabled = True
 
 
+    @property
+    def enabled_state_changed(self) -> pyqtBoundSignal:
+        """Signal emitted whenever the canvas is enabled or disabled."""
+        if self._signal_wrapper is None:
+            self._signal_wrapper = _SignalWrapper()
+        return self._signal_wrapper.enabled_state_changed
+
+
     def undo(self) -> None:
         """Reverses the last change applied to canvas image content."""
         if len(self._undo_stack) == 0:
             return
-        image = self.get_qimage().copy()
+        image = self._get_qimage_for_snapshot()
         self._redo_stack.append(Canvas.UndoState(image))
-        new_image = self._undo_stack.pop().image
-        if new_image.size() != self.size():
-            new_image = new_image.scaled(self.size())
+        new_image = self._undo_stack.pop().image()
+        size = self.size()
+        if new_image.size() != size:
+            new_image = new_image.scaled(size)
         self.set_image(new_image)
 
 
@@ -71,9 +97,10 @@ class Canvas():
         if len(self._redo_stack) == 0:
             return
         self._save_undo_state(False)
-        image = self._redo_stack.pop()
-        if image.size() != self.size():
-            image = image.scaled(self.size())
+        image = self._redo_stack.pop().image()
+        size = self.size()
+        if image.size() != size:
+            image = image.scaled(size)
         self.set_image(image)
 
 
@@ -84,7 +111,7 @@ class Canvas():
 
     def redo_count(self) -> int:
         """Returns the number of image states currently cached that can be restored through redo()."""
-        return len(self._undo_stack)
+        return len(self._redo_stack)
 
 
     def last_undo_timestamp(self) -> Optional[int]:
@@ -114,7 +141,8 @@ class Canvas():
             self._enabled = enabled
             if hasattr(self, 'setVisible'):
                 self.setVisible(enabled)
-            self.enabled_state_changed.emit(enabled)
+            if self._signal_wrapper is not None:
+                self._signal_wrapper.enabled_state_changed.emit(enabled)
 
 
     def enabled(self) -> bool:
@@ -141,8 +169,14 @@ class Canvas():
     def get_color_at_point(self, point: QPoint) -> QColor:
         """Returns canvas color at a particular QPoint, or a completely transparent QColor if the point is not within
         the canvas bounds."""
-        if self.get_qimage().rect().contains(point):
-            return self.get_qimage().pixelColor(point)
+        image = self.get_qimage()
+        if image.rect().contains(point):
+            pixel = image.pixel(point)
+            # pixel() returns premultiplied values for premultiplied formats, which would darken partially transparent
+            # colors:
+            if image.pixelFormat().premultiplied() == QPixelFormat.Premultiplied:
+                pixel = qUnpremultiply(pixel)
+            return QColor.fromRgba(pixel)
         return QColor(0, 0, 0, 0)
 
 
@@ -256,10 +290,17 @@ class Canvas():
         raise NotImplementedError('Canvas.draw_line() not implemented')
 
 
-    def _save_undo_state(self, clear_redo_stack: bool = True) -> None:
-        image = self.get_qimage().copy()
+    def _get_qimage_for_snapshot(self) -> QImage:
+        """Returns canvas contents as a QImage that won't be changed by later drawing operations. Implementations
+        that already return an independent image from get_qimage() can override this to skip the extra copy."""
+        return self.get_qimage().copy()
+
+
+    def _save_undo_state(self, clear_redo_stack: bool = True, image: Optional[QImage] = None) -> None:
+        """Saves canvas contents to the undo stack. If an image is provided, it will be saved instead of loading
+        canvas contents again, so it must not be changed by later drawing operations."""
+        if image is None:
+            image = self._get_qimage_for_snapshot()
         self._undo_stack.append(Canvas.UndoState(image))
-        if len(self._undo_stack) > Canvas.MAX_UNDO:
-            self._undo_stack = self._undo_stack[-Canvas.MAX_UNDO:]
         if clear_redo_stack:
             self._redo_stack.clear()
@@ -5,17 +5,18 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QColor
 
+# Linearized sRGB values for each 8-bit color component, calculated to fit W3C guidelines from
+# https://www.w3.org/TR/WCAG20/#relativeluminancedef
+_LINEAR_COMPONENTS = tuple(((c / 255) / 12.92) if (c / 255) <= 0.03928 else ((((c / 255) + 0.055) / 1.055) ** 2.4)
+        for c in range(256))
+
 def contrast_color(source: QWidget | QColor) -> QColor:
     """Finds an appropriate contrast color for displaying against a QColor or QWidget source."""
     if isinstance(source, QWidget):
         return source.palette().color(source.foregroundRole())
     if isinstance(source, QColor):
-        # Calculated to fit W3C guidelines from https://www.w3.org/TR/WCAG20/#relativeluminancedef
-        def adjust_component(c):
-            return (c / 12.92) if c <= 0.03928 else (((c + 0.055)/1.055) ** 2.4)
-        r = adjust_component(source.red() / 255)
-        g = adjust_component(source.green() / 255)
-        b = adjust_component(source.blue() / 255)
-        relative_luminance = (0.2126 * r) + (0.7152 * g) + (0.0722 * b)
+        relative_luminance = (0.2126 * _LINEAR_COMPONENTS[source.red()]) \
+                + (0.7152 * _LINEAR_COMPONENTS[source.green()]) \
+                + (0.0722 * _LINEAR_COMPONENTS[source.blue()])
         return Qt.black if relative_luminance < 0.179 else Qt.white
     raise ValueError(f"Invalid contrast_color parameter {source}")
@@ -1,7 +1,10 @@
 """Returns a QMargins object that is equally spaced on all sides."""
 
+from functools import lru_cache
 from PyQt5.QtCore import QMargins
 
+@lru_cache(maxsize=64)
 def get_equal_margins(size: int):
-    """Returns a QMargins object that is equally spaced on all sides."""
+    """Returns a QMargins object that is equally spaced on all sides. Returned objects are shared between callers, so
+    they should not be modified."""
     return QMargins(size, size, size, size)
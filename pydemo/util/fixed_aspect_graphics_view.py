@@ -1,27 +1,57 @@
 """A QGraphicsView that maintains an aspect ratio and simplifies scene management."""
 from typing import Optional
 from PyQt5.QtWidgets import QWidget, QGraphicsView, QGraphicsScene
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QTransform, QResizeEvent
-from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QRectF, QSize, QMarginsF
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QRegion, QColor, QTransform, QResizeEvent
+from PyQt5.QtCore import Qt, QEvent, QTimer, QPoint, QPointF, QRect, QRectF, QSize, QMarginsF
 from pydemo.util.get_scaled_placement import get_scaled_placement
 from pydemo.util.contrast_color import contrast_color
 
 class FixedAspectGraphicsView(QGraphicsView):
     """A QGraphicsView that maintains an aspect ratio and simplifies scene management."""
 
+    # After a resize, the background is scaled quickly and redrawn with smooth scaling once the size stays unchanged
+    # for this many milliseconds:
+    SMOOTH_BACKGROUND_DELAY = 150
+
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._scene = QGraphicsScene()
         self._content_size: Optional[QSize] = None
         self._content_rect: Optional[QRect] = None
-        self._background: Optional[QPixmap] = None
+        # Content size last used to set the scene rect, compared as integers to avoid redundant scene rect changes:
+        self._last_scene_size: Optional[QSize] = None
+        # Values derived from widget and content size, updated in resizeEvent:
+        self._cached_border_size = 1
+        self._widget_width = 1
+        self._widget_height = 1
+        self._scene_to_widget_transform = QTransform()
+        # Widget to painter transformation, cached along with the painter bounds it was created for:
+        self._widget_to_painter_transform = QTransform()
+        self._widget_to_painter_bounds: Optional[QRectF] = None
+        # Background data is kept as a QImage so that changing it doesn't require a pixmap upload:
+        self._background: Optional[QImage] = None
+        # The background scaled to its displayed size, recreated only when that size or the background changes:
+        self._scaled_background: Optional[QImage] = None
+        # Content size changes are applied once the event loop is idle, so repeated changes only cause one update:
+        self._content_update_timer = QTimer(self)
+        self._content_update_timer.setInterval(0)
+        self._content_update_timer.setSingleShot(True)
+        self._content_update_timer.timeout.connect(self._apply_pending_content_size)
+        self._smooth_background_timer = QTimer(self)
+        self._smooth_background_timer.setInterval(FixedAspectGraphicsView.SMOOTH_BACKGROUND_DELAY)
+        self._smooth_background_timer.setSingleShot(True)
+        self._smooth_background_timer.timeout.connect(self._rebuild_smooth_background)
+        # Palette-dependent painting values, discarded whenever the palette or style changes:
+        self._border_pen: Optional[QPen] = None
+        self._fill_color: Optional[QColor] = None
 
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.setCacheMode(QGraphicsView.CacheBackground)
         self.setTransformationAnchor(QGraphicsView.NoAnchor)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Only repaint changed areas. Background and border drawing is clipped to the exposed area, so small scene
+        # changes like brush strokes don't pay for repainting the whole viewport:
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
         self.setScene(self._scene)
 
 
@@ -33,12 +63,12 @@ class FixedAspectGraphicsView(QGraphicsView):
 
     @content_size.setter
     def content_size(self, new_size: QSize) -> None:
-        """Updates the actual (not displayed) size of the viewed content."""
+        """Updates the actual (not displayed) size of the viewed content. The displayed content bounds are updated
+        when the event loop is next idle, or on the next resizeEvent if that happens first."""
         if new_size == self.content_size:
             return
         self._content_size = new_size
-        self.resizeEvent(None)
-        self.resetCachedContent()
+        self._content_update_timer.start()
 
 
     @property
@@ -49,18 +79,23 @@ class FixedAspectGraphicsView(QGraphicsView):
         return self._content_rect.size()
 
     @property
-    def background(self) -> QPixmap | None:
+    def background(self) -> QImage | None:
         """Returns the background image content."""
         return self._background
 
     @background.setter
     def background(self, new_background: Optional[QImage | QPixmap]) -> None:
         """Updates the background image content."""
-        if isinstance(new_background, QImage):
-            self._background = QPixmap.fromImage(new_background)
-        else:
-            self._background = new_background
-        self.resetCachedContent()
+        if isinstance(new_background, QPixmap):
+            new_background = new_background.toImage()
+        # Qt's raster engine is optimized for these formats, so convert once here instead of while painting:
+        if new_background is not None and new_background.format() not in (QImage.Format_RGB32,
+                QImage.Format_ARGB32_Premultiplied):
+            new_background = new_background.convertToFormat(QImage.Format_ARGB32_Premultiplied
+                    if new_background.hasAlphaChannel() else QImage.Format_RGB32)
+        self._background = new_background
+        self._scaled_background = None
+        self.viewport().update()
 
 
     def widget_to_scene_coords(self, point: QPoint) -> QPointF:
@@ -71,20 +106,16 @@ class FixedAspectGraphicsView(QGraphicsView):
     def scene_to_widget_coords(self, point: QPoint) -> QPointF:
         """Returns a point within the widget bounds corresponding to some point within the scene content."""
         assert self._content_rect is not None and self.content_size is not None
-        x_scale = self._content_rect.width() / self.content_size.width()
-        y_scale = self._content_rect.height() / self.content_size.height()
-        x0 = self._content_rect.x()
-        y0 = self._content_rect.y()
-        return QPointF(x0 + point.x() * x_scale, y0 + point.y() * y_scale)
+        return self._scene_to_widget_transform.map(QPointF(point))
 
 
     def widget_to_painter_coords(self, point: QPoint | QPointF, painter_bounds: QRectF) -> QPointF:
         """Converts a point from widget coordinates to painter coordinates."""
-        x_scale = painter_bounds.width() / self.size().width()
-        y_scale = painter_bounds.height() / self.size().height()
-        x0 = painter_bounds.x()
-        y0 = painter_bounds.y()
-        return QPointF(x0 + point.x() * x_scale, y0 + point.y() * y_scale)
+        if painter_bounds != self._widget_to_painter_bounds:
+            self._widget_to_painter_transform = QTransform(painter_bounds.width() / self._widget_width, 0.0, 0.0,
+                    painter_bounds.height() / self._widget_height, painter_bounds.x(), painter_bounds.y())
+            self._widget_to_painter_bounds = QRectF(painter_bounds)
+        return self._widget_to_painter_transform.map(QPointF(point))
 
 
     def scene_point_to_painter_coords(self, point: QPoint, painter_rect: QRectF) -> QPointF:
@@ -93,28 +124,46 @@ class FixedAspectGraphicsView(QGraphicsView):
         return self.widget_to_painter_coords(widget_point, painter_rect)
 
 
-    def _content_rect_to_painter_coords(self, painter_rect: QRectF) -> QRectF:
-        """Converts a rectangle from scene coordinates to painter coordinates."""
+    def _content_rect_to_painter_coords(self) -> QRectF:
+        """Converts the content rectangle from widget coordinates to painter coordinates."""
         assert self._content_rect is not None
-        top_left = QPoint(self._content_rect.x(), self._content_rect.y())
-        bottom_right = QPoint(top_left.x() + self._content_rect.width(), top_left.y() + self._content_rect.height())
-        top_left = self.widget_to_painter_coords(top_left, painter_rect)
-        bottom_right = self.widget_to_painter_coords(bottom_right, painter_rect)
-        return QRectF(top_left.x(), top_left.y(), bottom_right.x() - top_left.x(), bottom_right.y() - top_left.y())
+        # Paint events may only cover part of the viewport, so map from the full viewport bounds:
+        painter_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        x_scale = painter_rect.width() / self._widget_width
+        y_scale = painter_rect.height() / self._widget_height
+        content_rect = self._content_rect
+        return QRectF(painter_rect.x() + content_rect.x() * x_scale, painter_rect.y() + content_rect.y() * y_scale,
+                content_rect.width() * x_scale, content_rect.height() * y_scale)
 
 
     def drawBackground(self, painter: Optional[QPainter], rect: QRectF) -> None:
         """Renders any background image behind all scene contents."""
         if painter is None or self._background is None or self._content_rect is None:
             return
-        content_rect = self._content_rect_to_painter_coords(rect)
-        if self._background is not None:
-            painter.drawPixmap(content_rect, self._background, QRectF(self._background.rect()))
+        content_rect = self._content_rect_to_painter_coords()
+        # Draw the background pre-scaled to its size on the device, so that repaints only need to copy pixels. The
+        # painter transformation is in logical pixels, so scale by the device pixel ratio to keep HiDPI detail:
+        device_rect = painter.transform().mapRect(content_rect).toRect()
+        pixel_ratio = painter.device().devicePixelRatioF()
+        pixel_size = device_rect.size() * pixel_ratio
+        if self._scaled_background is None:
+            self._scaled_background = self._background.scaled(pixel_size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation)
+            self._scaled_background.setDevicePixelRatio(pixel_ratio)
+        elif self._scaled_background.size() != pixel_size:
+            # Size changes usually come in bursts while the window is resized, so scale quickly until they stop:
+            self._scaled_background = self._background.scaled(pixel_size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.FastTransformation)
+            self._scaled_background.setDevicePixelRatio(pixel_ratio)
+            self._smooth_background_timer.start()
+        painter.save()
+        painter.resetTransform()
+        painter.drawImage(device_rect.topLeft(), self._scaled_background)
+        painter.restore()
         border_size = float(self._border_size())
         margins = QMarginsF(border_size, border_size, border_size, border_size)
         border_rect = content_rect.marginsAdded(margins)
-        painter.setPen(QPen(contrast_color(self), 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap,
-                    Qt.PenJoinStyle.RoundJoin))
+        painter.setPen(self._get_border_pen())
         painter.drawRect(border_rect)
 
 
@@ -122,49 +171,90 @@ class FixedAspectGraphicsView(QGraphicsView):
         """Draws a border around the scene area and blocks out any out-of-bounds content."""
         if painter is None:
             return
-        content_rect = self._content_rect_to_painter_coords(rect)
+        content_rect = self._content_rect_to_painter_coords()
         border_rect = content_rect.adjusted(-5.0, -5.0, 5.0, 5.0)
 
         # QGraphicsView fails to clip content sometimes, so fill everything outside of the scene with the
         # background color, then draw the border:
-        fill_color = self.palette().color(self.backgroundRole())
-        border_left = int(border_rect.x())
-        border_right = border_left + int(border_rect.width())
-        border_top = int(border_rect.y())
-        border_bottom = border_top + int(border_rect.height())
-
-        max_size = 200000000 # Larger than the viewport can ever possibly be, small enough to avoid overflow issues
-        painter.fillRect(border_left, -(max_size // 2), -max_size, max_size, fill_color)
-        painter.fillRect(border_right, -(max_size // 2), max_size, max_size, fill_color)
-        painter.fillRect(-(max_size // 2), border_top, max_size, -max_size, fill_color)
-        painter.fillRect(-(max_size // 2), border_bottom, max_size, max_size, fill_color)
-
-        painter.setPen(QPen(contrast_color(self), 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap,
-                    Qt.PenJoinStyle.RoundJoin))
+        if self._fill_color is None:
+            self._fill_color = self.palette().color(self.backgroundRole())
+        # Clip to the area outside the border and fill it all at once. Regions are integer-based, so this is done in
+        # device coordinates to avoid rounding errors being scaled up by the view transformation:
+        transform = painter.transform()
+        device_rect = transform.mapRect(rect).toAlignedRect()
+        outside_border = QRegion(device_rect).subtracted(QRegion(transform.mapRect(border_rect).toRect()))
+        painter.save()
+        painter.resetTransform()
+        painter.setClipRegion(outside_border, Qt.ClipOperation.IntersectClip)
+        painter.fillRect(device_rect, self._fill_color)
+        painter.restore()
+
+        painter.setPen(self._get_border_pen())
         painter.drawRect(border_rect)
         super().drawForeground(painter, rect)
 
 
+    def changeEvent(self, event: Optional[QEvent]) -> None:
+        """Discard cached painting values when the palette or style changes."""
+        super().changeEvent(event)
+        if event is not None and event.type() in (QEvent.PaletteChange, QEvent.StyleChange):
+            self._border_pen = None
+            self._fill_color = None
+
+
     def resizeEvent(self, event: Optional[QResizeEvent]) -> None:
         """Recalculate content size when the widget is resized."""
         super().resizeEvent(event)
+        self._content_update_timer.stop()
         if self.content_size is None:
             raise RuntimeError('FixedAspectGraphicsView implementations must set content_size in __init__ before the ' +
                     'first resizeEvent is triggered')
-        content_rect_f = QRectF(0.0, 0.0, float(self.content_size.width()), float(self.content_size.height()))
-        if content_rect_f != self._scene.sceneRect():
-            self._scene.setSceneRect(content_rect_f)
-
-        border_size = self._border_size()
-        self._content_rect = get_scaled_placement(QRect(QPoint(0, 0), self.size()), self.content_size, border_size)
+        if self.content_size != self._last_scene_size:
+            self._scene.setSceneRect(QRectF(0.0, 0.0, float(self.content_size.width()),
+                    float(self.content_size.height())))
+            self._last_scene_size = QSize(self.content_size)
+
+        self._widget_width = max(self.width(), 1)
+        self._widget_height = max(self.height(), 1)
+        self._cached_border_size = (min(self._widget_width, self._widget_height) // 40) + 1
+        self._content_rect = get_scaled_placement(QRect(QPoint(0, 0), self.size()), self.content_size,
+                self._cached_border_size)
         x_scale = self._content_rect.width() / self.content_size.width()
         y_scale = self._content_rect.height() / self.content_size.height()
+        x0 = float(self._content_rect.x())
+        y0 = float(self._content_rect.y())
+        # This maps scene coordinates into the content rect directly. It differs from the view transformation, which
+        # applies the offset before scaling and relies on view alignment for centering:
+        self._scene_to_widget_transform = QTransform(x_scale, 0.0, 0.0, y_scale, x0, y0)
+        # Widget size changed, so any cached widget to painter transformation is no longer valid:
+        self._widget_to_painter_bounds = None
         transformation = QTransform()
         transformation.scale(x_scale, y_scale)
-        transformation.translate(float(self._content_rect.x()), float(self._content_rect.y()))
+        transformation.translate(x0, y0)
         self.setTransform(transformation)
         self.update()
 
 
     def _border_size(self) -> int:
-        return (min(self.width(), self.height()) // 40) + 1
+        return self._cached_border_size
+
+
+    def _apply_pending_content_size(self) -> None:
+        self.resizeEvent(None)
+
+
+    def _rebuild_smooth_background(self) -> None:
+        if self._background is None or self._scaled_background is None:
+            return
+        pixel_ratio = self._scaled_background.devicePixelRatioF()
+        self._scaled_background = self._background.scaled(self._scaled_background.size(),
+                Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self._scaled_background.setDevicePixelRatio(pixel_ratio)
+        self.viewport().update()
+
+
+    def _get_border_pen(self) -> QPen:
+        if self._border_pen is None:
+            self._border_pen = QPen(contrast_color(self), 4, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap,
+                    Qt.PenJoinStyle.RoundJoin)
+        return self._border_pen
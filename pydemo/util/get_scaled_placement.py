@@ -19,12 +19,14 @@ def get_scaled_placement(container_rect: QRect,
     placement : QRect
         Size and position of the scaled rectangle within container_rect.
     """
-    container_size = container_rect.size() - QSize(margin_width * 2, margin_width * 2)
-    scale = min(container_size.width()/max(inner_size.width(), 1), container_size.height()/max(inner_size.height(), 1))
-    x = container_rect.x() + margin_width
-    y = container_rect.y() + margin_width
-    if (inner_size.width() * scale) < container_size.width():
-        x += (container_size.width() - inner_size.width() * scale) / 2
-    if (inner_size.height() * scale) < container_size.height():
-        y += (container_size.height() - inner_size.height() * scale) / 2
-    return QRect(int(x), int(y), int(inner_size.width() * scale), int(inner_size.height() * scale))
+    container_width = container_rect.width() - margin_width * 2
+    container_height = container_rect.height() - margin_width * 2
+    inner_width = inner_size.width()
+    inner_height = inner_size.height()
+    scale = min(container_width / max(inner_width, 1), container_height / max(inner_height, 1))
+    scaled_width = int(inner_width * scale)
+    scaled_height = int(inner_height * scale)
+    # The scaled size never exceeds the container size, so centering never needs a negative offset:
+    x = container_rect.x() + margin_width + (container_width - scaled_width) // 2
+    y = container_rect.y() + margin_width + (container_height - scaled_height) // 2
+    return QRect(x, y, scaled_width, scaled_height)
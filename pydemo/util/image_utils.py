@@ -1,28 +1,41 @@
 """Adds general-purpose utility functions for manipulating image data"""
 
-import io
-from PIL import Image
+from typing import TYPE_CHECKING
 from PyQt5.QtGui import QImage
-from PyQt5.QtCore import QBuffer
 
+# PIL is imported when first needed, so that loading this module doesn't load PIL and its image libraries:
+if TYPE_CHECKING:
+    from PIL import Image
 
-def pil_image_to_qimage(pil_image: Image.Image) -> QImage:
-    """Convert a PIL Image to a RGB888 formatted PyQt5 QImage."""
+
+def pil_image_to_qimage(pil_image: 'Image.Image') -> QImage:
+    """Convert a PIL Image to a PyQt5 QImage, RGB888 formatted for RGB images or RGBA8888 formatted otherwise."""
+    from PIL import Image
     if isinstance(pil_image, Image.Image):
-        return QImage(pil_image.tobytes("raw","RGB"),
-                pil_image.width,
-                pil_image.height,
-                pil_image.width * 3,
-                QImage.Format_RGB888)
+        if pil_image.mode == 'RGB':
+            image_format, bytes_per_pixel = QImage.Format_RGB888, 3
+        else:
+            if pil_image.mode != 'RGBA':
+                pil_image = pil_image.convert('RGBA')
+            image_format, bytes_per_pixel = QImage.Format_RGBA8888, 4
+        return QImage(pil_image.tobytes(), pil_image.width, pil_image.height, pil_image.width * bytes_per_pixel,
+                image_format)
     raise TypeError("Invalid PIL Image parameter.")
 
 
-def qimage_to_pil_image(qimage: QImage) -> Image.Image:
-    """Convert a PyQt5 QImage to a PIL image, in PNG format."""
+def qimage_to_pil_image(qimage: QImage) -> 'Image.Image':
+    """Convert a PyQt5 QImage to a PIL image, in RGBA mode if the QImage has an alpha channel or RGB mode otherwise."""
     if isinstance(qimage, QImage):
-        buffer = QBuffer()
-        buffer.open(QBuffer.ReadWrite)
-        qimage.save(buffer, "PNG")
-        pil_im = Image.open(io.BytesIO(buffer.data()))
-        return pil_im
+        from PIL import Image
+        if qimage.hasAlphaChannel():
+            mode, qimage_format = 'RGBA', QImage.Format_RGBA8888
+        else:
+            mode, qimage_format = 'RGB', QImage.Format_RGB888
+        if qimage.format() != qimage_format:
+            qimage = qimage.convertToFormat(qimage_format)
+        # Copy pixel data directly, passing the line stride so that any padding at the end of each line is skipped:
+        bits = qimage.constBits()
+        bits.setsize(qimage.sizeInBytes())
+        return Image.frombytes(mode, (qimage.width(), qimage.height()), bits.asstring(), 'raw', mode,
+                qimage.bytesPerLine())
     raise TypeError("Invalid QImage parameter.")
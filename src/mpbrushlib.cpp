@@ -54,6 +54,10 @@ void MPBrushLib::load_image(const QImage& image) {
     MPHandler::handler()->loadImage(image);
 }
 
+void MPBrushLib::load_image_resize(const QImage& image) {
+    MPHandler::handler()->loadImageResized(image);
+}
+
 QImage MPBrushLib::render_image() {
     return MPHandler::handler()->renderImage();
 }
@@ -74,6 +78,10 @@ void MPBrushLib::stroke_to(float x, float y, float pressure, float xtilt, float
     MPHandler::handler()->strokeTo(x, y, pressure, xtilt, ytilt);
 }
 
+void MPBrushLib::stroke_to_batch(const QVector<qreal>& points) {
+    MPHandler::handler()->strokeToBatch(points);
+}
+
 float MPBrushLib::get_brush_value(MPBrushLib::BrushSetting valueType) {
     return MPHandler::handler()->getBrushValue((MyPaintBrushSetting) valueType);
 }
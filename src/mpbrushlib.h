@@ -5,6 +5,7 @@
 #include <QString>
 #include <QSize>
 #include <QColor>
+#include <QVector>
 #include <QGraphicsScene>
 
 class SignalHandler;
@@ -25,6 +26,8 @@ public:
     static void set_brush_color(QColor color);
 
     static void load_image(const QImage& image);
+
+    static void load_image_resize(const QImage& image);
     
     static QImage render_image();
 
@@ -38,6 +41,8 @@ public:
 
     static void stroke_to(float x, float y, float pressure, float xtilt, float ytilt);
 
+    static void stroke_to_batch(const QVector<qreal>& points);
+
     enum class BrushSetting {
         MYPAINT_BRUSH_SETTING_OPAQUE,
         MYPAINT_BRUSH_SETTING_OPAQUE_MULTIPLY,
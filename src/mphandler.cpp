@@ -136,6 +136,15 @@ void MPHandler::loadImage(const QImage &image)
     m_surface->loadImage(image);
 }
 
+void MPHandler::loadImageResized(const QImage &image)
+{
+    // Resize only when needed: setSize reallocates all surface buffers.
+    if (m_surface->size() != image.size()) {
+        m_surface->setSize(image.size());
+    }
+    m_surface->loadImage(image);
+}
+
 void MPHandler::loadBrush(const QByteArray &content)
 {
     m_brush->load(content);
@@ -172,6 +181,25 @@ MPHandler::strokeTo(float x, float y)
     strokeTo(x, y, pressure, xtilt, ytilt);
 }
 
+void
+MPHandler::strokeToBatch(const QVector<qreal>& points)
+{
+    // points holds consecutive (x, y, pressure) values. All of them are drawn within a single atomic surface
+    // operation, so updated tiles are only processed once per batch.
+    float dtime = 1.0/10;
+    mypaint_surface_begin_atomic((MyPaintSurface *)m_surface);
+    for (int i = 0; i + 2 < points.size(); i += 3) {
+        mypaint_brush_stroke_to(m_brush->brush, (MyPaintSurface *)m_surface, points[i], points[i + 1],
+                points[i + 2], 0.0, 0.0, dtime, 1.0, 0.0, 0.0, true);
+    }
+
+    static MyPaintRectangle rectangle_buf [RECTANGLE_BUF_SIZE];
+    MyPaintRectangles roi;
+    roi.rectangles = rectangle_buf;
+    roi.num_rectangles = RECTANGLE_BUF_SIZE;
+    mypaint_surface_end_atomic((MyPaintSurface *)m_surface, &roi);
+}
+
 void
 MPHandler::endStroke()
 {
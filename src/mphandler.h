@@ -28,6 +28,7 @@ SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #define MPHANDLER_H
 
 #include <QColor>
+#include <QVector>
 
 #include "mypaint-brush.h"
 #include "mypaint-surface.h"
@@ -58,6 +59,7 @@ public:
     void startStroke();
     void strokeTo(float x, float y, float pressure, float xtilt, float ytilt);
     void strokeTo(float x, float y);
+    void strokeToBatch(const QVector<qreal>& points);
     void endStroke();
 
     float getBrushValue(MyPaintBrushSetting setting);
@@ -76,6 +78,7 @@ public:
     QImage renderImage();
 
     void loadImage(const QImage &image);
+    void loadImageResized(const QImage &image);
 
 
 public slots:
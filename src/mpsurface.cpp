@@ -120,6 +120,10 @@ void MPSurface::loadImage(const QImage &image)
     int nbTilesOnHeight = ceil((float)this->height / (float)tileSize.height());
 
     QImage sourceImage = image.scaled(this->size(), Qt::IgnoreAspectRatio);
+    if (sourceImage.format() != QImage::Format_ARGB32) {
+        sourceImage = sourceImage.convertToFormat(QImage::Format_ARGB32);
+    }
+    const QRect sourceRect = sourceImage.rect();
 
     int nbTiles = 0;
 
@@ -131,7 +135,14 @@ void MPSurface::loadImage(const QImage &image)
             QPoint tilePos = getTilePos(idx) ;
 
             QRect tileRect = QRect(tilePos, tileSize);
-            QImage tileImage = sourceImage.copy(tileRect);
+
+            // Tiles within the image bounds are read directly from the source image memory, tiles on the edges are
+            // copied so that out of bounds pixels are transparent.
+            const bool insideImage = sourceRect.contains(tileRect);
+            QImage tileImage = insideImage
+                    ? QImage(sourceImage.constScanLine(tilePos.y()) + (tilePos.x() * 4), tileSize.width(),
+                            tileSize.height(), sourceImage.bytesPerLine(), QImage::Format_ARGB32)
+                    : sourceImage.copy(tileRect);
 
             // Optimization : Fully transparent (empty) tiles
             // don't need to be created.
@@ -141,7 +152,8 @@ void MPSurface::loadImage(const QImage &image)
                 nbTiles ++;
 
                 MPTile *tile = getTileFromIdx(idx);
-                tile->setImage(tileImage);
+                // The tile keeps its image, so images that share sourceImage memory need to be detached first:
+                tile->setImage(insideImage ? tileImage.copy() : tileImage);
 
                 this->onUpdateTileFunction(this, tile);
             }
@@ -281,17 +293,16 @@ void MPSurface::resetSurface(QSize size)
     resetNullTile();
 }
 
-bool MPSurface::isFullyTransparent(QImage image)
+bool MPSurface::isFullyTransparent(const QImage &image)
 {
-    image.convertToFormat(QImage::Format_ARGB32);
-
-    for (int x = 0 ; x < image.width() ; x++) {
+    // Expects Format_ARGB32 image data, so pixels can be read directly from each scanline.
+    for (int y = 0 ; y < image.height() ; y++) {
 
-        for (int y = 0 ; y < image.height() ; y++) {
+        const QRgb* line = reinterpret_cast<const QRgb*>(image.constScanLine(y));
 
-            QRgb currentPixel = (image.pixel(x, y));
+        for (int x = 0 ; x < image.width() ; x++) {
 
-            if (qAlpha(currentPixel) != 0) {
+            if (qAlpha(line[x]) != 0) {
                 return false;
 
             }
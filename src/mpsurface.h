@@ -87,7 +87,7 @@ public:
 private:
     void resetNullTile();
     void resetSurface(QSize size);
-    bool isFullyTransparent(QImage image);
+    bool isFullyTransparent(const QImage &image);
     std::string key;
 
     int tiles_width; // width in tiles
@@ -17,6 +17,10 @@ SignalHandler::SignalHandler(QGraphicsScene* scene, int z_value) {
         }
     }
 
+    updateTimer.setSingleShot(true);
+    updateTimer.setInterval(0);
+    connect(&updateTimer, SIGNAL(timeout()), this, SLOT(flushTileUpdates()));
+
     MPHandler* mypaint = MPHandler::handler();
     connect(mypaint, SIGNAL(newTile(MPSurface*, MPTile*)), this, SLOT(onNewTile(MPSurface*, MPTile*)));
     connect(mypaint, SIGNAL(updateTile(MPSurface*, MPTile*)), this, SLOT(onUpdateTile(MPSurface*, MPTile*)));
@@ -35,5 +39,19 @@ void SignalHandler::onNewTile(MPSurface *surface, MPTile *tile)
 void SignalHandler::onUpdateTile(MPSurface *surface, MPTile *tile)
 {
     Q_UNUSED(surface);
-    tile->update();
+    if (tile == nullptr) {
+        return;
+    }
+    pendingTiles.insert(tile);
+    if (!updateTimer.isActive()) {
+        updateTimer.start();
+    }
+}
+
+void SignalHandler::flushTileUpdates()
+{
+    for (MPTile* tile : pendingTiles) {
+        tile->update();
+    }
+    pendingTiles.clear();
 }
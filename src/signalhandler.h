@@ -3,6 +3,8 @@
 
 #include <QObject>
 #include <QGraphicsScene>
+#include <QSet>
+#include <QTimer>
 #include "mpsurface.h"
 #include "mptile.h"
 
@@ -16,9 +18,16 @@ public slots:
     void onNewTile(MPSurface *surface, MPTile *tile);
     void onUpdateTile(MPSurface *surface, MPTile *tile);
 
+private slots:
+    void flushTileUpdates();
+
 private:
     int z_value;
     QGraphicsScene* scene;
+    // Tiles updated since the last flush. Each one is invalidated once when control returns to the event loop,
+    // no matter how many times brushlib updated it.
+    QSet<MPTile*> pendingTiles;
+    QTimer updateTimer;
 
 };
 
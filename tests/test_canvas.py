@@ -0,0 +1,36 @@
+"""Tests for the shared Canvas interface."""
+import pytest
+
+pytest.importorskip('PIL')
+QtGui = pytest.importorskip('PyQt5.QtGui')
+from PyQt5.QtCore import QPoint
+from pydemo.util.canvas import Canvas
+
+
+class _ImageCanvas(Canvas):
+    """Minimal Canvas that returns a fixed image."""
+
+    def __init__(self, image: QtGui.QImage) -> None:
+        super().__init__(None)
+        self._fixed_image = image
+
+    def get_qimage(self) -> QtGui.QImage:
+        return self._fixed_image
+
+
+def test_get_color_at_point_unpremultiplies_partial_alpha():
+    image = QtGui.QImage(1, 1, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtGui.QColor(200, 100, 50, 128))
+    color = _ImageCanvas(image).get_color_at_point(QPoint(0, 0))
+    assert color.alpha() == 128
+    # Premultiplication rounding may lose a little precision, but values must not be darkened by alpha:
+    assert abs(color.red() - 200) <= 2
+    assert abs(color.green() - 100) <= 2
+    assert abs(color.blue() - 50) <= 2
+
+
+def test_get_color_at_point_outside_bounds_is_transparent():
+    image = QtGui.QImage(1, 1, QtGui.QImage.Format_ARGB32)
+    image.fill(QtGui.QColor(200, 100, 50, 128))
+    color = _ImageCanvas(image).get_color_at_point(QPoint(5, 5))
+    assert color.alpha() == 0